@@ -9,7 +9,7 @@ except ImportError:  # pragma: no cover
     _BASE_EXCEPTION_GROUP_TYPE = None  # type: ignore[assignment]
 
 from entity.enums import AgentInputMode
-from schema_registry import iter_model_provider_schemas
+from schema_registry import ModelProviderSchemaSpec, iter_model_provider_schemas
 from utils.strs import titleize
 
 from entity.configs.base import (
@@ -579,9 +579,24 @@ class AgentConfig(BaseConfig):
             return "openai"
         return provider_names[0]
 
+    @staticmethod
+    def _provider_is_available(spec: ModelProviderSchemaSpec) -> bool:
+        if spec.is_available is None:
+            return True
+        try:
+            return bool(spec.is_available())
+        except Exception:
+            # A failing probe only hides the provider; it must not break the schema.
+            return False
+
     @staticmethod
     def _provider_registry_snapshot() -> tuple[List[str], Dict[str, Dict[str, Any]]]:
-        specs = iter_model_provider_schemas()
+        # Only offer providers whose SDK or CLI is present in this environment.
+        specs = {
+            name: spec
+            for name, spec in iter_model_provider_schemas().items()
+            if AgentConfig._provider_is_available(spec)
+        }
         names = list(specs.keys())
         metadata: Dict[str, Dict[str, Any]] = {}
         for name, spec in specs.items():
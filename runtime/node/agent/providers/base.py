@@ -1,4 +1,6 @@
 """Abstract base classes for agent providers."""
+import functools
+import logging
 from abc import ABC, abstractmethod
 from typing import Any, Dict, List, Optional
 
@@ -28,6 +30,16 @@ class ModelProvider(ABC):
         self.provider = config.provider
         self.params = config.params or {}
 
+    @classmethod
+    def is_available(cls) -> bool:
+        """
+        Report whether the provider can run in this environment.
+
+        Subclasses backed by an external binary or service override this
+        with a cheap probe; SDK-backed providers are available once imported.
+        """
+        return True
+
     @abstractmethod
     def create_client(self):
         """
@@ -75,8 +87,20 @@ class ModelProvider(ABC):
         pass
 
 
+logger = logging.getLogger(__name__)
+
 _provider_registry = Registry("agent_provider")
 
+# Providers found unusable in this process: name -> reason. Each is logged once.
+_unavailable_providers: Dict[str, str] = {}
+
+
+def _mark_unavailable(name: str, reason: str, exc_info: BaseException | None = None) -> None:
+    if name in _unavailable_providers:
+        return
+    _unavailable_providers[name] = reason
+    logger.warning("Provider '%s' is unavailable: %s", name, reason, exc_info=exc_info)
+
 
 class ProviderRegistry:
     """Registry facade for agent providers."""
@@ -89,6 +113,36 @@ class ProviderRegistry:
         *,
         label: str | None = None,
         summary: str | None = None,
+    ) -> None:
+        cls._register_entry(name, label=label, summary=summary, target=provider_class)
+
+    @classmethod
+    def register_lazy(
+        cls,
+        name: str,
+        module_path: str,
+        class_name: str,
+        *,
+        label: str | None = None,
+        summary: str | None = None,
+    ) -> None:
+        """Register a provider by dotted path; the module is imported on first lookup."""
+        cls._register_entry(
+            name,
+            label=label,
+            summary=summary,
+            module_path=module_path,
+            attr_name=class_name,
+        )
+
+    @classmethod
+    def _register_entry(
+        cls,
+        name: str,
+        *,
+        label: str | None,
+        summary: str | None,
+        **source: Any,
     ) -> None:
         metadata = {
             "label": label,
@@ -96,8 +150,13 @@ class ProviderRegistry:
         }
         # Drop None values so schema consumers don't need to filter.
         metadata = {key: value for key, value in metadata.items() if value is not None}
-        _provider_registry.register(name, target=provider_class, metadata=metadata)
-        register_model_provider_schema(name, label=label, summary=summary)
+        _provider_registry.register(name, metadata=metadata, **source)
+        register_model_provider_schema(
+            name,
+            label=label,
+            summary=summary,
+            is_available=functools.partial(cls.is_available, name),
+        )
 
     @classmethod
     def get_provider(cls, name: str) -> type | None:
@@ -105,7 +164,32 @@ class ProviderRegistry:
             entry = _provider_registry.get(name)
         except Exception:
             return None
-        return entry.load()
+        try:
+            return entry.load()
+        except (ImportError, FileNotFoundError) as exc:
+            # Optional SDK or CLI missing. ``from google import genai`` raises
+            # a plain ImportError when another google.* package is installed,
+            # so keep the traceback around in case it is a real bug.
+            _mark_unavailable(name, str(exc), exc_info=exc)
+            return None
+
+    @classmethod
+    def is_available(cls, name: str) -> bool:
+        """Import the provider on demand and ask it whether it can run here."""
+        provider_class = cls.get_provider(name)
+        if provider_class is None:
+            return False
+        if not provider_class.is_available():
+            _mark_unavailable(name, "required CLI or service not found")
+            return False
+        # Forget an earlier failed probe (e.g. the CLI was installed since).
+        _unavailable_providers.pop(name, None)
+        return True
+
+    @classmethod
+    def missing(cls) -> Dict[str, str]:
+        """Return providers that failed to load or probe, mapped to the reason."""
+        return dict(_unavailable_providers)
 
     @classmethod
     def list_providers(cls) -> List[str]:
@@ -8,10 +8,14 @@ Claude Code works in its native agentic mode, using its own built-in tools
 etc. The provider returns the text result from Claude's work.
 """
 
+import functools
+import io
 import json
 import os
+import re
 import subprocess
 import shutil
+import signal
 import tempfile
 import threading
 from pathlib import Path
@@ -26,6 +30,202 @@ from entity.tool_spec import ToolSpec
 from runtime.node.agent import ModelProvider, ModelResponse
 from utils.token_tracker import TokenUsage
 
+try:  # pragma: no cover - orjson is an optional speedup
+    import orjson
+
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:  # pragma: no cover
+    _json_loads = json.loads
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+# Pipe buffer and read size for the stream-json output.
+_STREAM_CHUNK_SIZE = 1 << 16
+
+# chatdev-reporter MCP server script, resolved once at import.
+_MCP_REPORTER_PATH = str(
+    Path(__file__).resolve().parents[4] / "mcp_servers" / "chatdev_reporter.py"
+)
+
+# Errors that mean the --resume session is gone and a fresh run should be tried.
+_SESSION_ERROR_RE = re.compile(r"session|resume", re.IGNORECASE)
+
+# Shared read-only default for responses without a usage block.
+_EMPTY_USAGE: Dict[str, Any] = {}
+
+_CLAUDE_FALLBACK_PATHS = (
+    "/usr/local/bin/claude",
+    "/opt/homebrew/bin/claude",
+    "~/.local/bin/claude",
+)
+
+
+# Successful CLI lookups: (name, fallbacks) -> path. Misses are not cached,
+# so a CLI installed while the server runs is picked up on the next probe.
+_cli_binary_cache: Dict[tuple, str] = {}
+
+
+def _resolve_cli_binary(name: str, fallbacks: tuple[str, ...]) -> Optional[str]:
+    """Locate a CLI binary on PATH or in well-known install locations.
+
+    Hits are cached per process so constructing one provider per agent node
+    does not repeat the PATH scan.
+    """
+    key = (name, fallbacks)
+    path = _cli_binary_cache.get(key)
+    if path:
+        return path
+    path = shutil.which(name)
+    if not path:
+        for candidate in fallbacks:
+            candidate = os.path.expanduser(candidate)
+            if os.path.isfile(candidate) and os.access(candidate, os.X_OK):
+                path = candidate
+                break
+        else:
+            return None
+    _cli_binary_cache[key] = path
+    return path
+
+
+_EMPTY_MESSAGE: Dict[str, Any] = {}
+
+
+_PROGRESS_REPORTING_BLOCK = (
+    "[Progress Reporting]:\n"
+    "You have a report_progress MCP tool available. Call it at natural "
+    "transition points (e.g. after analyzing requirements, before starting "
+    "implementation, after writing key files, before/after running tests). "
+    "Keep reports concise (1-2 sentences). Do NOT over-report — 2-5 calls "
+    "per session is ideal. If reporting fails, continue your work normally."
+)
+
+
+@functools.lru_cache(maxsize=32)
+def _working_dir_block(workspace_root: str) -> str:
+    """Prompt section pointing Claude at the workspace directory."""
+    return (
+        f"[Working Directory]: {workspace_root}\n"
+        "Your current working directory is set to the project workspace above. "
+        "All files you create with your Write tool will be saved there. "
+        "Use relative paths (e.g. 'main.py', 'src/utils.py') for all file operations."
+    )
+
+
+def _summarize_tool_result(content: Any, limit: int = 200) -> str:
+    """Render a tool_result payload for display without stringifying all of it.
+
+    Tool output can be megabytes (e.g. Bash results); only the first
+    ``limit`` characters are ever shown, so non-str payloads are rendered
+    piecewise and stop once enough text has been collected.
+    """
+    if isinstance(content, str):
+        return content
+    if isinstance(content, (bytes, bytearray, memoryview)):
+        return bytes(content[:limit]).decode("utf-8", "replace")
+    if isinstance(content, list):
+        # Anthropic tool_result content blocks: [{"type": "text", "text": ...}]
+        parts: List[str] = []
+        total = 0
+        for item in content:
+            if isinstance(item, dict) and isinstance(item.get("text"), str):
+                piece = item["text"]
+            else:
+                piece = str(item)
+            parts.append(piece)
+            total += len(piece)
+            if total >= limit:
+                break
+        return "".join(parts)[:limit]
+    return repr(content)[:limit]
+
+
+class _StreamState:
+    """Mutable state accumulated while consuming one stream-json run.
+
+    Each ``on_<type>`` method handles one NDJSON event type; see
+    ``_STREAM_EVENT_HANDLERS`` for the dispatch table.
+    """
+
+    __slots__ = (
+        "stream_callback",
+        "accumulated_text",
+        "session_id",
+        "result_data",
+        "pending_tool",
+    )
+
+    def __init__(self, stream_callback: Optional[Any]) -> None:
+        self.stream_callback = stream_callback
+        self.accumulated_text = io.StringIO()
+        self.session_id: Optional[str] = None
+        self.result_data: dict = {}
+        self.pending_tool: Optional[dict] = None
+
+    def close_pending_tool(self) -> None:
+        """Emit tool_end for the in-flight tool, if any."""
+        if self.pending_tool and self.stream_callback:
+            self.stream_callback("tool_end", self.pending_tool)
+        self.pending_tool = None
+
+    def on_system(self, event: dict) -> None:
+        self.session_id = event.get("session_id") or self.session_id
+
+    def on_assistant(self, event: dict) -> None:
+        callback = self.stream_callback
+        msg = event.get("message") or _EMPTY_MESSAGE
+        for block in msg.get("content") or ():
+            block_get = block.get
+            block_type = block_get("type")
+            if block_type == "tool_use":
+                # Close previous tool if any, then emit the new tool start
+                self.close_pending_tool()
+                self.pending_tool = {
+                    "name": block_get("name", "unknown"),
+                    "input": block_get("input", {}),
+                    "id": block_get("id"),
+                }
+                if callback:
+                    callback("tool_start", self.pending_tool)
+            elif block_type == "text":
+                text = block_get("text", "")
+                if text:
+                    # Text blocks are joined with newlines.
+                    if self.accumulated_text.tell():
+                        self.accumulated_text.write("\n")
+                    self.accumulated_text.write(text)
+                # Text after a tool means tool finished
+                self.close_pending_tool()
+
+    def on_user(self, event: dict) -> None:
+        # User events with tool_result indicate tool completion.
+        # This is a more reliable tool_end signal than text blocks.
+        msg = event.get("message") or _EMPTY_MESSAGE
+        for block in msg.get("content") or ():
+            if block.get("type") != "tool_result":
+                continue
+            if self.pending_tool and self.stream_callback:
+                self.pending_tool["result"] = _summarize_tool_result(
+                    block.get("content", ""),
+                )
+                self.close_pending_tool()
+
+    def on_result(self, event: dict) -> None:
+        # Close last pending tool
+        self.close_pending_tool()
+        self.result_data = event
+        self.session_id = event.get("session_id") or self.session_id
+
+
+_STREAM_EVENT_HANDLERS = {
+    "system": _StreamState.on_system,
+    "assistant": _StreamState.on_assistant,
+    "user": _StreamState.on_user,
+    "result": _StreamState.on_result,
+}
 
 
 class ClaudeCodeProvider(ModelProvider):
@@ -38,89 +238,141 @@ class ClaudeCodeProvider(ModelProvider):
     preserved across multiple calls for the same agent node.
     """
 
-    # Thread-safe session storage: node_id -> session_id
+    # Session storage: node_id -> session_id. Single dict operations are
+    # atomic under the GIL, so no lock is taken on the per-call paths.
     _sessions: Dict[str, str] = {}
-    _sessions_lock = threading.Lock()
+    # Last (sessions mapping, file mtime_ns) written per sessions file, to
+    # skip redundant writes
+    _persisted_sessions: Dict[str, tuple] = {}
 
     @classmethod
     def get_session(cls, node_id: str) -> Optional[str]:
         """Get existing session ID for a node."""
-        with cls._sessions_lock:
-            return cls._sessions.get(node_id)
+        return cls._sessions.get(node_id)
 
     @classmethod
     def set_session(cls, node_id: str, session_id: str) -> None:
         """Store session ID for a node."""
-        with cls._sessions_lock:
-            cls._sessions[node_id] = session_id
+        cls._sessions[node_id] = session_id
 
     @classmethod
     def clear_session(cls, node_id: str) -> None:
         """Clear session for a specific node."""
-        with cls._sessions_lock:
-            cls._sessions.pop(node_id, None)
+        cls._sessions.pop(node_id, None)
 
     @classmethod
     def clear_all_sessions(cls) -> None:
         """Clear all sessions (call when workflow completes)."""
-        with cls._sessions_lock:
-            cls._sessions.clear()
+        cls._sessions.clear()
+        cls._persisted_sessions.clear()
 
     @classmethod
     def save_sessions_to_workspace(cls, workspace_root: str) -> None:
-        """Persist current sessions to workspace for future continuation."""
+        """Persist current sessions to workspace for future continuation.
+
+        The file is replaced atomically, and the write is skipped when the
+        sessions have not changed since the last save to the same path and
+        the file has not been touched since.
+        """
+        snapshot = dict(cls._sessions)
+        if not snapshot:
+            return
         path = Path(workspace_root) / ".claude_sessions.json"
-        with cls._sessions_lock:
-            if cls._sessions:
-                path.write_text(json.dumps(cls._sessions))
+        key = str(path)
+        try:
+            current = os.stat(path)
+        except FileNotFoundError:
+            current = None
+        if current is not None and cls._persisted_sessions.get(key) == (
+            snapshot, current.st_mtime_ns,
+        ):
+            return
+        # Unique temp name so concurrent savers never share a partial file.
+        # Created with 0666 so the kernel applies the umask, as open() would.
+        tmp_path = f"{path}.{os.urandom(6).hex()}.tmp"
+        fd = os.open(
+            tmp_path,
+            os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0),
+            0o666,
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(_json_dumps(snapshot))
+            if current is not None:
+                # Keep the permissions of the file being replaced.
+                os.chmod(tmp_path, current.st_mode & 0o777)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        cls._persisted_sessions[key] = (snapshot, os.stat(path).st_mtime_ns)
 
     @classmethod
     def load_sessions_from_workspace(cls, workspace_root: str) -> None:
         """Load previously saved sessions from workspace."""
         path = Path(workspace_root) / ".claude_sessions.json"
-        if path.exists():
-            try:
-                data = json.loads(path.read_text())
-                with cls._sessions_lock:
-                    cls._sessions.update(data)
-            except (json.JSONDecodeError, OSError):
-                pass
+        try:
+            data = _json_loads(path.read_bytes())
+        except (ValueError, OSError):
+            # Missing or unreadable file: nothing to restore.
+            return
+        cls._sessions.update(data)
 
     def __init__(self, config: AgentConfig):
         super().__init__(config)
         self._claude_binary = self._find_claude_binary()
         self._model_flag = self._resolve_model_flag()
+        # Flags that never change for this provider instance.
+        # --verbose is required when using --output-format stream-json with
+        # -p (print) mode; without it Claude CLI exits with an error.
+        # --dangerously-skip-permissions keeps -p mode from blocking on
+        # permission prompts and producing empty output.
+        self._fixed_flags: tuple[str, ...] = (
+            "--output-format", "stream-json",
+            "--verbose",
+            "--dangerously-skip-permissions",
+        ) + (("--model", self._model_flag) if self._model_flag else ())
+
+    @classmethod
+    def is_available(cls) -> bool:
+        """Return True when the claude CLI can be found."""
+        return _resolve_cli_binary("claude", _CLAUDE_FALLBACK_PATHS) is not None
 
     def _find_claude_binary(self) -> str:
         """Locate the claude binary."""
-        path = shutil.which("claude")
+        path = _resolve_cli_binary("claude", _CLAUDE_FALLBACK_PATHS)
         if path:
             return path
-        for candidate in [
-            "/usr/local/bin/claude",
-            "/opt/homebrew/bin/claude",
-            os.path.expanduser("~/.local/bin/claude"),
-        ]:
-            if os.path.isfile(candidate):
-                return candidate
         raise FileNotFoundError(
             "Claude Code CLI not found. Install it or ensure 'claude' is in PATH."
         )
 
+    # claude CLI accepts: sonnet, opus, haiku, or full model IDs
+    _EXACT_MODEL_FLAGS: Dict[str, Optional[str]] = {
+        "": None,
+        "claude": None,
+        "default": None,
+        "sonnet": "sonnet",
+        "opus": "opus",
+        "haiku": "haiku",
+    }
+    _MODEL_FAMILY_FLAGS = (
+        ("opus", "opus"),
+        ("sonnet", "sonnet"),
+        ("haiku", "haiku"),
+    )
+
     def _resolve_model_flag(self) -> Optional[str]:
         """Map model name to claude CLI --model flag."""
         name = (self.model_name or "").lower().strip()
-        if not name or name in ("claude", "default"):
-            return None
-        # claude CLI accepts: sonnet, opus, haiku, or full model IDs
-        if name in ("sonnet", "opus", "haiku"):
-            return name
-        if "opus" in name:
-            return "opus"
-        if "sonnet" in name:
-            return "sonnet"
-        if "haiku" in name:
-            return "haiku"
+        if name in self._EXACT_MODEL_FLAGS:
+            return self._EXACT_MODEL_FLAGS[name]
+        for needle, flag in self._MODEL_FAMILY_FLAGS:
+            if needle in name:
+                return flag
         return name
 
     def create_client(self):
@@ -157,56 +409,39 @@ class ClaudeCodeProvider(ModelProvider):
         existing_session = self.get_session(node_id) if node_id else None
         is_continuation = existing_session is not None
 
-        # Create MCP config for chatdev-reporter
+        # Create temp MCP config for chatdev-reporter
         mcp_config_path = self._create_mcp_config(
             node_id or "", session_id, server_port,
         ) if session_id else None
 
-        # Build prompt (simplified for continuations)
-        prompt = self._build_prompt(
-            conversation, tool_specs,
-            is_continuation=is_continuation,
-            workspace_root=workspace_root,
-        )
-
-        cmd = [client, "-p", prompt, "--output-format", "stream-json"]
-
-        # --verbose is required when using --output-format stream-json with -p
-        # (print) mode.  Without it Claude CLI exits with an error.
-        cmd.append("--verbose")
-
-        # Skip all permission checks for non-interactive mode.
-        # Without this, -p mode blocks on permission prompts and produces
-        # empty output.
-        cmd.append("--dangerously-skip-permissions")
-
-        # Resume existing session or start new one
-        if existing_session:
-            cmd.extend(["--resume", existing_session])
-            cmd.extend(["--max-turns", "20"])
-        else:
-            cmd.extend(["--max-turns", "15"])
-
-        if mcp_config_path:
-            cmd.extend(["--mcp-config", mcp_config_path])
+        try:
+            # Build prompt (simplified for continuations)
+            prompt = self._build_prompt(
+                conversation, tool_specs,
+                is_continuation=is_continuation,
+                workspace_root=workspace_root,
+            )
 
-        if self._model_flag:
-            cmd.extend(["--model", self._model_flag])
+            # Resume existing session or start new one
+            cmd = self._build_command(
+                client, prompt,
+                resume_session=existing_session,
+                mcp_config_path=mcp_config_path,
+            )
 
-        # Set CWD to workspace root so Claude's file operations land in the
-        # correct directory. Ensure the directory exists.
-        cwd = None
-        if workspace_root:
-            ws_path = Path(workspace_root)
-            ws_path.mkdir(parents=True, exist_ok=True)
-            cwd = str(ws_path)
+            # Set CWD to workspace root so Claude's file operations land in the
+            # correct directory. Ensure the directory exists.
+            cwd = None
+            if workspace_root:
+                ws_path = Path(workspace_root)
+                ws_path.mkdir(parents=True, exist_ok=True)
+                cwd = str(ws_path)
 
-        # Snapshot workspace before Claude Code runs so we can diff afterwards
-        before_snapshot = self._snapshot_workspace(cwd) if cwd else {}
+            # Snapshot workspace before Claude Code runs so we can diff afterwards
+            before_snapshot = self._snapshot_workspace(cwd) if cwd else {}
 
-        timeout = kwargs.pop("timeout", 600)
+            timeout = kwargs.pop("timeout", 600)
 
-        try:
             raw_response, stderr_text = self._run_streaming(
                 cmd, cwd, timeout, stream_callback,
             )
@@ -226,20 +461,15 @@ class ClaudeCodeProvider(ModelProvider):
 
             # Check for session resume errors and retry without --resume
             error_msg = raw_response.get("error", "")
-            if existing_session and error_msg and ("session" in error_msg.lower() or "resume" in error_msg.lower()):
+            if existing_session and error_msg and _SESSION_ERROR_RE.search(error_msg):
                 # Session expired or invalid - clear it and retry without resume
                 if node_id:
                     self.clear_session(node_id)
 
                 # Retry without --resume flag
-                cmd_retry = [client, "-p", prompt, "--output-format", "stream-json"]
-                cmd_retry.append("--verbose")
-                cmd_retry.append("--dangerously-skip-permissions")
-                cmd_retry.extend(["--max-turns", "15"])
-                if mcp_config_path:
-                    cmd_retry.extend(["--mcp-config", mcp_config_path])
-                if self._model_flag:
-                    cmd_retry.extend(["--model", self._model_flag])
+                cmd_retry = self._build_command(
+                    client, prompt, mcp_config_path=mcp_config_path,
+                )
 
                 raw_response, stderr_text = self._run_streaming(
                     cmd_retry, cwd, timeout, stream_callback,
@@ -279,6 +509,23 @@ class ClaudeCodeProvider(ModelProvider):
         finally:
             self._cleanup_mcp_config(mcp_config_path)
 
+    def _build_command(
+        self,
+        client: str,
+        prompt: str,
+        resume_session: Optional[str] = None,
+        mcp_config_path: Optional[str] = None,
+    ) -> List[str]:
+        """Build the claude CLI argv, resuming ``resume_session`` when given."""
+        cmd = [client, "-p", prompt, *self._fixed_flags]
+        if resume_session:
+            cmd += ("--resume", resume_session, "--max-turns", "20")
+        else:
+            cmd += ("--max-turns", "15")
+        if mcp_config_path:
+            cmd += ("--mcp-config", mcp_config_path)
+        return cmd
+
     # ------------------------------------------------------------------
     # Streaming helpers
     # ------------------------------------------------------------------
@@ -298,9 +545,10 @@ class ClaudeCodeProvider(ModelProvider):
             cmd,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
-            text=True,
-            encoding="utf-8",
+            bufsize=_STREAM_CHUNK_SIZE,
             cwd=cwd,
+            # Own process group, so a timeout also stops tools Claude spawned.
+            process_group=0,
         )
 
         timed_out = False
@@ -308,105 +556,161 @@ class ClaudeCodeProvider(ModelProvider):
         def _kill():
             nonlocal timed_out
             timed_out = True
-            process.kill()
+            self._kill_process_tree(process)
 
         timer = threading.Timer(timeout, _kill)
         timer.start()
 
-        accumulated_text: List[str] = []
-        session_id: Optional[str] = None
-        result_data: dict = {}
-        pending_tool: Optional[dict] = None
-
-        try:
-            for line in process.stdout:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    event = json.loads(line)
-                except json.JSONDecodeError:
-                    continue
+        # Drain stderr concurrently so a chatty CLI can't fill the pipe and
+        # block while we are only reading stdout.
+        stderr_chunks: List[bytes] = []
+        stderr_reader = threading.Thread(
+            target=self._drain_pipe,
+            args=(process.stderr, stderr_chunks),
+            name="claude-cli-stderr",
+            daemon=True,
+        )
+        stderr_reader.start()
 
-                event_type = event.get("type")
-
-                if event_type == "system":
-                    session_id = event.get("session_id") or session_id
-
-                elif event_type == "assistant":
-                    msg = event.get("message", {})
-                    content_blocks = msg.get("content", [])
-                    for block in content_blocks:
-                        if block.get("type") == "tool_use":
-                            # Close previous tool if any
-                            if pending_tool and stream_callback:
-                                stream_callback("tool_end", pending_tool)
-                            # Emit new tool start
-                            pending_tool = {
-                                "name": block.get("name", "unknown"),
-                                "input": block.get("input", {}),
-                                "id": block.get("id"),
-                            }
-                            if stream_callback:
-                                stream_callback("tool_start", pending_tool)
-                        elif block.get("type") == "text":
-                            text = block.get("text", "")
-                            if text:
-                                accumulated_text.append(text)
-                            # Text after a tool means tool finished
-                            if pending_tool and stream_callback:
-                                stream_callback("tool_end", pending_tool)
-                                pending_tool = None
-
-                elif event_type == "user":
-                    # User events with tool_result indicate tool completion.
-                    # This is a more reliable tool_end signal than text blocks.
-                    msg = event.get("message", {})
-                    content_blocks = msg.get("content", [])
-                    for block in content_blocks:
-                        if block.get("type") == "tool_result":
-                            result_content = block.get("content", "")
-                            if pending_tool and stream_callback:
-                                pending_tool["result"] = (
-                                    result_content
-                                    if isinstance(result_content, str)
-                                    else str(result_content)[:200]
-                                )
-                                stream_callback("tool_end", pending_tool)
-                                pending_tool = None
-
-                elif event_type == "result":
-                    # Close last pending tool
-                    if pending_tool and stream_callback:
-                        stream_callback("tool_end", pending_tool)
-                        pending_tool = None
-                    result_data = event
-                    session_id = event.get("session_id") or session_id
+        state = _StreamState(stream_callback)
+        handlers = _STREAM_EVENT_HANDLERS
 
+        # Hot path: one iteration per NDJSON event. Per-event cost is JSON
+        # decoding plus handler dispatch in the interpreter (CPU-bound);
+        # pipe reads are batched in _iter_ndjson and stderr is drained on
+        # its own thread, so keep per-event work in this loop minimal.
+        try:
+            for event in self._iter_ndjson(process.stdout):
+                handler = handlers.get(event.get("type"))
+                if handler is not None:
+                    handler(state, event)
+        except BaseException:
+            # The CLI's own process group doesn't receive the terminal's
+            # Ctrl-C, so stop it here instead of waiting for the timeout.
+            self._kill_process_tree(process)
+            raise
         finally:
-            timer.cancel()
+            # Keep the timeout armed while reaping, so a CLI that closes
+            # stdout but never exits is still killed.
             process.wait()
-
-        stderr_text = ""
-        try:
-            stderr_text = process.stderr.read() if process.stderr else ""
-        except Exception:
-            pass
+            timer.cancel()
+            stderr_reader.join(timeout=5)
 
         if timed_out:
-            return {"error": "timeout"}, stderr_text
+            return {"error": "timeout"}, self._decode_stderr(stderr_chunks)
 
         # Build raw_response from stream data
         raw_response = self._parse_stream_result(
-            result_data, accumulated_text, session_id,
+            state.result_data, state.accumulated_text.getvalue(), state.session_id,
         )
         raw_response["_returncode"] = process.returncode
-        return raw_response, stderr_text
+
+        # stderr is only surfaced when there is no result text, so skip
+        # decoding it for successful runs.
+        if raw_response.get("result") and process.returncode == 0:
+            return raw_response, ""
+        return raw_response, self._decode_stderr(stderr_chunks)
+
+    @staticmethod
+    def _drain_pipe(stream: Any, chunks: List[bytes]) -> None:
+        """Read a pipe to EOF into ``chunks`` (runs on a helper thread)."""
+        if stream is None:
+            return
+        try:
+            fd = stream.fileno()
+            while True:
+                chunk = os.read(fd, _STREAM_CHUNK_SIZE)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+        except (OSError, ValueError):
+            pass
+        finally:
+            try:
+                stream.close()
+            except OSError:
+                pass
+
+    @staticmethod
+    def _decode_stderr(chunks: List[bytes]) -> str:
+        """Join and decode captured stderr output."""
+        return b"".join(chunks).decode("utf-8", errors="replace")
+
+    @staticmethod
+    def _kill_process_tree(
+        process: subprocess.Popen, grace_period: float = 0.25,
+    ) -> None:
+        """Stop the CLI's process group: SIGTERM now, SIGKILL after a grace period.
+
+        The CLI is started as its own process-group leader, so its pid is
+        the group id and no getpgid() lookup is needed.
+        """
+        if not hasattr(os, "killpg"):
+            process.kill()
+            return
+        pgid = process.pid
+        try:
+            os.killpg(pgid, signal.SIGTERM)
+        except ProcessLookupError:
+            return
+
+        def _force_kill() -> None:
+            try:
+                os.killpg(pgid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+
+        threading.Timer(grace_period, _force_kill).start()
+
+    @staticmethod
+    def _iter_ndjson(stream: Any, chunk_size: int = _STREAM_CHUNK_SIZE):
+        """Yield JSON objects from an NDJSON byte stream.
+
+        Reads whatever is available (up to ``chunk_size``) per syscall and
+        splits it into lines, instead of one readline per event. Only the new
+        chunk is split; an unfinished line is kept as a list of pieces and
+        joined once its newline arrives, so multi-MB tool_result lines cost
+        linear time. Lines stay as bytes since both orjson and json accept
+        them directly. Lines that do not start with ``{`` (blank lines,
+        plain-text noise) are skipped without invoking the parser;
+        undecodable lines are skipped too.
+        """
+        loads = _json_loads
+        pending: List[bytes] = []
+        while True:
+            chunk = stream.read1(chunk_size)
+            if not chunk:
+                break
+            lines = chunk.split(b"\n")
+            if len(lines) == 1:
+                pending.append(chunk)
+                continue
+            if pending:
+                pending.append(lines[0])
+                lines[0] = b"".join(pending)
+                pending.clear()
+            tail = lines.pop()
+            if tail:
+                pending.append(tail)
+            for line in lines:
+                line = line.strip()
+                if not line.startswith(b"{"):
+                    continue
+                try:
+                    yield loads(line)
+                except ValueError:
+                    continue
+        line = b"".join(pending).strip()
+        if line.startswith(b"{"):
+            try:
+                yield loads(line)
+            except ValueError:
+                pass
 
     def _parse_stream_result(
         self,
         result_data: dict,
-        accumulated_text: List[str],
+        accumulated_text: str,
         session_id: Optional[str],
     ) -> dict:
         """Build a raw_response dict from streamed data, compatible with
@@ -416,14 +720,14 @@ class ClaudeCodeProvider(ModelProvider):
             raw = dict(result_data)
             # Ensure result text is populated
             if not raw.get("result") and accumulated_text:
-                raw["result"] = "\n".join(accumulated_text)
+                raw["result"] = accumulated_text
             if session_id:
                 raw.setdefault("session_id", session_id)
             return raw
 
         # No result event received — fallback
         return {
-            "result": "\n".join(accumulated_text) if accumulated_text else "",
+            "result": accumulated_text,
             "session_id": session_id,
             "type": "result",
         }
@@ -445,13 +749,16 @@ class ClaudeCodeProvider(ModelProvider):
         if not isinstance(response, dict):
             return TokenUsage()
 
-        usage = response.get("usage", {}) or {}
-        cost = response.get("total_cost_usd", 0) or 0
+        r_get = response.get
+        usage = r_get("usage") or _EMPTY_USAGE
+        cost = r_get("total_cost_usd") or 0
 
-        # Try modelUsage for detailed per-model breakdown
-        model_usage = response.get("modelUsage", {})
-        if model_usage and not usage.get("input_tokens"):
-            for _model, stats in model_usage.items():
+        input_tokens = usage.get("input_tokens", 0)
+        if not input_tokens:
+            # Try modelUsage for detailed per-model breakdown
+            model_usage = r_get("modelUsage")
+            if model_usage:
+                stats = next(iter(model_usage.values()))
                 input_tokens = stats.get("inputTokens", 0)
                 output_tokens = stats.get("outputTokens", 0)
                 return TokenUsage(
@@ -461,9 +768,7 @@ class ClaudeCodeProvider(ModelProvider):
                     metadata={"total_cost_usd": cost, **stats},
                 )
 
-        input_tokens = usage.get("input_tokens", 0)
         output_tokens = usage.get("output_tokens", 0)
-
         return TokenUsage(
             input_tokens=input_tokens,
             output_tokens=output_tokens,
@@ -538,25 +843,24 @@ class ClaudeCodeProvider(ModelProvider):
             parts.append(self._format_tool_specs(tool_specs, workspace_root))
 
         if workspace_root and not is_continuation:
-            parts.append(
-                f"[Working Directory]: {workspace_root}\n"
-                "Your current working directory is set to the project workspace above. "
-                "All files you create with your Write tool will be saved there. "
-                "Use relative paths (e.g. 'main.py', 'src/utils.py') for all file operations."
-            )
+            parts.append(_working_dir_block(str(workspace_root)))
 
         if not is_continuation:
-            parts.append(
-                "[Progress Reporting]:\n"
-                "You have a report_progress MCP tool available. Call it at natural "
-                "transition points (e.g. after analyzing requirements, before starting "
-                "implementation, after writing key files, before/after running tests). "
-                "Keep reports concise (1-2 sentences). Do NOT over-report — 2-5 calls "
-                "per session is ideal. If reporting fails, continue your work normally."
-            )
+            parts.append(_PROGRESS_REPORTING_BLOCK)
 
         return "\n\n".join(parts)
 
+    # ChatDev tool-name substrings -> native Claude Code tool hint, checked
+    # in priority order (a "read_and_write" tool maps to Write).
+    _NATIVE_TOOL_HINTS = (
+        (("save_file", "write"),
+         "  -> Use your Write tool to create/save files with relative paths."),
+        (("read",),
+         "  -> Use your Read tool to read file contents."),
+        (("run", "exec", "bash"),
+         "  -> Use your Bash tool to execute commands."),
+    )
+
     def _format_tool_specs(
         self, tool_specs: List[ToolSpec], workspace_root: Optional[Any] = None,
     ) -> str:
@@ -570,21 +874,17 @@ class ClaudeCodeProvider(ModelProvider):
         for spec in tool_specs:
             name = spec.name
             desc = spec.description or ""
-            if "save_file" in name or "write" in name.lower():
-                tool_mappings.append(
-                    f"- {name}: {desc}\n"
-                    "  -> Use your Write tool to create/save files with relative paths."
-                )
-            elif "read_file" in name or "read" in name.lower():
-                tool_mappings.append(
-                    f"- {name}: {desc}\n"
-                    "  -> Use your Read tool to read file contents."
-                )
-            elif "run" in name.lower() or "exec" in name.lower() or "bash" in name.lower():
-                tool_mappings.append(
-                    f"- {name}: {desc}\n"
-                    "  -> Use your Bash tool to execute commands."
-                )
+            lname = name.lower()
+            hint = next(
+                (
+                    hint
+                    for needles, hint in self._NATIVE_TOOL_HINTS
+                    if any(needle in lname for needle in needles)
+                ),
+                None,
+            )
+            if hint:
+                tool_mappings.append(f"- {name}: {desc}\n{hint}")
             else:
                 tool_mappings.append(f"- {name}: {desc}")
 
@@ -632,12 +932,8 @@ class ClaudeCodeProvider(ModelProvider):
         Returns the path to the temp file, or None if creation fails.
         """
         try:
-            mcp_server_path = str(
-                Path(__file__).resolve().parents[4]
-                / "mcp_servers"
-                / "chatdev_reporter.py"
-            )
-            if not Path(mcp_server_path).exists():
+            mcp_server_path = _MCP_REPORTER_PATH
+            if not os.path.exists(mcp_server_path):
                 return None
 
             config = {
@@ -655,8 +951,8 @@ class ClaudeCodeProvider(ModelProvider):
             }
 
             fd, path = tempfile.mkstemp(suffix=".json", prefix="chatdev_mcp_")
-            with os.fdopen(fd, "w") as f:
-                json.dump(config, f)
+            with os.fdopen(fd, "wb") as f:
+                f.write(_json_dumps(config))
             return path
         except Exception:
             return None
@@ -690,30 +986,40 @@ class ClaudeCodeProvider(ModelProvider):
         """Take a lightweight snapshot of workspace files.
 
         Returns a dict of ``{relative_path: (size, mtime_ns)}``.
+
+        Walks the tree with ``os.scandir`` and prunes hidden and excluded
+        directories at descent time, so their contents are never listed.
         """
         snapshot: Dict[str, tuple] = {}
-        root = Path(workspace_root)
-        if not root.exists():
+        if not os.path.isdir(workspace_root):
             return snapshot
 
-        for item in root.rglob("*"):
-            if not item.is_file():
-                continue
-            rel = item.relative_to(root)
-            # Skip hidden and excluded directories
-            if any(
-                part.startswith(".") or part in self._SCAN_EXCLUDE_DIRS
-                for part in rel.parts[:-1]  # check parent dirs, not filename
-            ):
-                continue
-            # Skip excluded files (e.g., firebase-debug.log, .DS_Store)
-            if rel.name in self._SCAN_EXCLUDE_FILES:
-                continue
+        exclude_dirs = self._SCAN_EXCLUDE_DIRS
+        exclude_files = self._SCAN_EXCLUDE_FILES
+        sep = os.sep
+        stack = [(workspace_root, "")]
+        while stack:
+            dir_path, prefix = stack.pop()
             try:
-                st = item.stat()
-                snapshot[str(rel)] = (st.st_size, st.st_mtime_ns)
+                it = os.scandir(dir_path)
             except OSError:
                 continue
+            with it:
+                for entry in it:
+                    name = entry.name
+                    try:
+                        # Symlinked directories are not descended into.
+                        if entry.is_dir(follow_symlinks=False):
+                            if not name.startswith(".") and name not in exclude_dirs:
+                                stack.append((entry.path, prefix + name + sep))
+                            continue
+                        # Skip excluded files (e.g., firebase-debug.log, .DS_Store)
+                        if name in exclude_files or not entry.is_file():
+                            continue
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    snapshot[prefix + name] = (st.st_size, st.st_mtime_ns)
         return snapshot
 
     @staticmethod
@@ -722,43 +1028,54 @@ class ClaudeCodeProvider(ModelProvider):
         after: Dict[str, tuple],
     ) -> List[Dict[str, Any]]:
         """Compare two workspace snapshots and return a list of changes."""
+        # Runs that touch no files are common; dict equality settles them
+        # in C without the per-path loop below.
+        if before == after:
+            return []
         changes: List[Dict[str, Any]] = []
-        for path, (size, mtime) in after.items():
-            if path not in before:
-                changes.append({"path": path, "change": "created", "size": size})
-            elif before[path] != (size, mtime):
-                changes.append({"path": path, "change": "modified", "size": size})
-        for path in before:
-            if path not in after:
-                changes.append({"path": path, "change": "deleted", "size": 0})
+        before_get = before.get
+        for path, stat in after.items():
+            previous = before_get(path)
+            if previous is None:
+                changes.append({"path": path, "change": "created", "size": stat[0]})
+            elif previous != stat:
+                changes.append({"path": path, "change": "modified", "size": stat[0]})
+        deleted = before.keys() - after.keys()
+        if deleted:
+            # Iterate ``before`` to keep deletions in snapshot order.
+            for path in before:
+                if path in deleted:
+                    changes.append({"path": path, "change": "deleted", "size": 0})
         return changes
 
     def _parse_cli_output(self, result: subprocess.CompletedProcess) -> dict:
         """Parse the JSON output from claude CLI."""
-        stdout = result.stdout or ""
-        if not stdout.strip():
+        stdout = (result.stdout or "").strip()
+        if not stdout:
             return {
                 "result": "",
                 "error": result.stderr or "empty response",
                 "returncode": result.returncode,
             }
 
-        # Single JSON object (normal --output-format json)
-        try:
-            return json.loads(stdout)
-        except json.JSONDecodeError:
-            pass
+        # Single JSON object (normal --output-format json). Plain-text
+        # output can't be a JSON document, so don't pay for a failed parse.
+        if stdout[0] in "{[":
+            try:
+                return _json_loads(stdout)
+            except ValueError:
+                pass
 
         # Stream mode: try last result-type line
-        for line in reversed(stdout.strip().splitlines()):
+        for line in reversed(stdout.splitlines()):
             line = line.strip()
-            if not line:
+            if not line.startswith("{"):
                 continue
             try:
-                parsed = json.loads(line)
+                parsed = _json_loads(line)
                 if isinstance(parsed, dict) and parsed.get("type") == "result":
                     return parsed
-            except json.JSONDecodeError:
+            except ValueError:
                 continue
 
-        return {"result": stdout.strip(), "type": "text_fallback"}
+        return {"result": stdout, "type": "text_fallback"}
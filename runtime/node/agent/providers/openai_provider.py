@@ -4,6 +4,7 @@ import base64
 import hashlib
 
 import binascii
+import json
 import os
 from typing import Any, Dict, List, Optional, Union
 from urllib.parse import unquote_to_bytes
@@ -717,8 +718,6 @@ class OpenAIProvider(ModelProvider):
             return None
         if isinstance(arguments, (dict, list)):
             try:
-                import json
-
                 arguments_str = json.dumps(arguments, ensure_ascii=False)
             except Exception:
                 arguments_str = str(arguments)
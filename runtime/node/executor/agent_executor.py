@@ -63,6 +63,11 @@ class AgentNodeExecutor(NodeExecutor):
             self._current_node_id = node.id
             provider_class = ProviderRegistry.get_provider(agent_config.provider)
             if not provider_class:
+                reason = ProviderRegistry.missing().get(agent_config.provider)
+                if reason:
+                    raise ValueError(
+                        f"Provider '{agent_config.provider}' is unavailable: {reason}"
+                    )
                 raise ValueError(f"Provider '{agent_config.provider}' not found")
 
             agent_config.token_tracker = self.context.get_token_tracker()
@@ -1,6 +1,6 @@
 """Loop counter guard node executor."""
 
-from typing import List, Dict, Any
+from typing import List, Dict
 
 from entity.configs import Node
 from entity.configs.node.loop_counter import LoopCounterConfig
@@ -34,20 +34,20 @@ class LoopCounterNodeExecutor(NodeExecutor):
             raise ValueError(f"Node {node.id} missing loop_counter configuration")
 
         state = self._get_state()
-        counter = state.setdefault(node.id, {"count": 0})
-        counter["count"] += 1
-        count = counter["count"]
+        count = state.get(node.id, 0) + 1
+        state[node.id] = count
 
         if count < config.max_iterations:
             self.log_manager.debug(
                 f"LoopCounter {node.id}: iteration {count}/{config.max_iterations} (pass-through)"
             )
-            # Pass input through so the "continue" edge fires.
-            return list(inputs) if inputs else []
+            # Pass input through so the "continue" edge fires. The graph only
+            # iterates the returned list, so hand back the input list as is.
+            return inputs or []
 
         # --- Exhausted ---
         if config.reset_on_emit:
-            counter["count"] = 0
+            state[node.id] = 0
 
         raw_message = config.message or f"Loop limit reached ({config.max_iterations})"
         content = f"{LOOP_EXIT_MARKER}: {raw_message}"
@@ -70,5 +70,5 @@ class LoopCounterNodeExecutor(NodeExecutor):
             metadata=metadata,
         )]
 
-    def _get_state(self) -> Dict[str, Dict[str, Any]]:
+    def _get_state(self) -> Dict[str, int]:
         return self.context.global_state.setdefault(self.STATE_KEY, {})
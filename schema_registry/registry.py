@@ -1,7 +1,7 @@
 """Schema registries for entity-layer configuration classes."""
 
 from dataclasses import dataclass, field
-from typing import Any, Dict, Mapping, MutableMapping, Type
+from typing import Any, Callable, Dict, Mapping, MutableMapping, Type
 from entity.configs.base import BaseConfig
 
 
@@ -59,6 +59,8 @@ class ModelProviderSchemaSpec:
     label: str | None = None
     summary: str | None = None
     metadata: Dict[str, Any] = field(default_factory=dict)
+    # Optional probe; providers it rejects are left out of schema listings.
+    is_available: Callable[[], bool] | None = None
 
 
 _node_schemas: Dict[str, NodeSchemaSpec] = {}
@@ -254,6 +256,7 @@ def register_model_provider_schema(
     label: str | None = None,
     summary: str | None = None,
     metadata: Mapping[str, Any] | None = None,
+    is_available: Callable[[], bool] | None = None,
 ) -> ModelProviderSchemaSpec:
     spec = _model_provider_schemas.get(name)
     if spec:
@@ -261,9 +264,13 @@ def register_model_provider_schema(
             spec.label = label
         if summary:
             spec.summary = summary
+        if is_available:
+            spec.is_available = is_available
         _update_metadata(spec.metadata, metadata)
         return spec
-    spec = ModelProviderSchemaSpec(name=name, label=label, summary=summary)
+    spec = ModelProviderSchemaSpec(
+        name=name, label=label, summary=summary, is_available=is_available,
+    )
     _update_metadata(spec.metadata, metadata)
     _model_provider_schemas[name] = spec
     return spec
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Tests for the Claude Code stream-json line framing (_iter_ndjson)."""
+
+import io
+import json
+import sys
+import time
+
+sys.path.insert(0, '.')
+
+from runtime.node.agent.providers.claude_code_provider import ClaudeCodeProvider
+
+
+def _parse(data: bytes, chunk_size: int = 1 << 16) -> list:
+    stream = io.BufferedReader(io.BytesIO(data), chunk_size)
+    return list(ClaudeCodeProvider._iter_ndjson(stream, chunk_size))
+
+
+def test_line_split_across_reads():
+    data = b'{"type":"system","session_id":"abc"}\n{"type":"result","result":"done"}\n'
+    # 5-byte reads split every event over several chunks.
+    events = _parse(data, chunk_size=5)
+    assert events == [
+        {"type": "system", "session_id": "abc"},
+        {"type": "result", "result": "done"},
+    ], events
+
+
+def test_final_line_without_newline():
+    events = _parse(b'{"a":1}\n{"b":2}', chunk_size=4)
+    assert events == [{"a": 1}, {"b": 2}], events
+
+
+def test_noise_lines_skipped():
+    data = b'warning: something\n\n   \n{"a":1}\n{not json}\n\r\n{"b":2}\r\ntrailing text'
+    events = _parse(data)
+    assert events == [{"a": 1}, {"b": 2}], events
+
+
+def test_multi_megabyte_line():
+    payload = "x" * (32 << 20)
+    big = json.dumps({"type": "user", "content": payload}).encode()
+    data = b'{"a":1}\n' + big + b'\n{"b":2}\n'
+    start = time.monotonic()
+    events = _parse(data)
+    elapsed = time.monotonic() - start
+    assert len(events) == 3, len(events)
+    assert events[1]["content"] == payload
+    assert events[2] == {"b": 2}
+    # Framing must stay linear in the line length; quadratic re-splitting
+    # of the tail took several seconds for a line this size.
+    assert elapsed < 3, f"32 MB line took {elapsed:.2f}s"
+
+
+if __name__ == "__main__":
+    tests = [
+        test_line_split_across_reads,
+        test_final_line_without_newline,
+        test_noise_lines_skipped,
+        test_multi_megabyte_line,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"  ✓ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"  ❌ {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
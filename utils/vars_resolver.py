@@ -47,6 +47,9 @@ class PlaceholderResolver:
         return value
 
     def _resolve_string(self, raw: str, path: str, stack: Sequence[str]) -> Any:
+        # Most config strings carry no placeholder; skip both regex passes.
+        if "${" not in raw:
+            return raw
         only_match = _PLACEHOLDER_ONLY_PATTERN.fullmatch(raw)
         if only_match:
             var_name = only_match.group(1)